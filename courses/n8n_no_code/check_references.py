@@ -13,17 +13,48 @@ Checks:
  8. {download} directives point to existing files
  9. Sticky notes in workflow JSONs have valid ezponda.github.io URLs
 10. Deprecated $node['...'] syntax in workflow JSONs
-11. (Optional, --check-urls) HEAD-request all external URLs
+11. (Optional, --check-urls) HEAD-request all external URLs.  URLs that
+    answered OK are remembered in .check_urls_cache.json for a week and
+    not re-requested; failures are always re-checked.
 
 Usage:
     python3 courses/n8n_no_code/check_references.py              # checks 1-9
     python3 courses/n8n_no_code/check_references.py --check-urls  # checks 1-10
+    python3 courses/n8n_no_code/check_references.py --fail-fast   # stop at first error
+
+Only the standard library is required.  If orjson is installed it is used
+to parse workflow JSONs (faster); otherwise the stdlib json module is used.
+If PyYAML is installed (it comes with jupyter-book) _toc.yml is parsed with
+it, through libyaml's C loader when available; otherwise a line-based
+fallback parser is used.
 """
 
 import argparse
+import functools
 import json
+import os
 import re
+import string
+import time
+import urllib.parse
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import orjson  # optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
+try:
+    import yaml  # optional: installed with jupyter-book
+except ImportError:
+    yaml = None
+    _YAML_LOADER = None
+else:
+    # libyaml-backed loader when PyYAML was built with it
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -32,51 +63,315 @@ SCRIPT_DIR = Path(__file__).parent
 BOOK_DIR = SCRIPT_DIR / "book"
 WORKFLOWS_DIR = SCRIPT_DIR / "book" / "_static" / "workflows"
 
+# Upper bound on threads used for per-file work / URL requests
+MAX_WORKERS = 8
+URL_WORKERS = 16
+
+# Check 11: URLs that answered OK, with when they were last checked
+URL_CACHE_PATH = SCRIPT_DIR / ".check_urls_cache.json"
+URL_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+# ---------------------------------------------------------------------------
+# Patterns (compiled once at import)
+# ---------------------------------------------------------------------------
+# _toc.yml lines
+_TOC_CAPTION_RE = re.compile(r"\s*-\s*caption:\s*(.+)")
+_TOC_FILE_RE = re.compile(r"(\s*)-\s*file:\s*(.+)")
+
+# Page titles and the intro "Course Structure" table
+_PAGE_TITLE_RE = re.compile(r"#\s+(.+)")
+_TITLE_PREFIX_RE = re.compile(r"^(?:Appendix\s+[A-Z]:\s*|Project\s+\d+:\s*)")
+_APPENDIX_TITLE_RE = re.compile(r"#\s+Appendix\s+([A-Z]):\s+")
+_PROJECT_TITLE_RE = re.compile(r"#\s+Project\s+(\d+):\s+")
+_APPENDIX_PREFIX_RE = re.compile(r"Appendix\s+[A-Z]:")
+_PROJECT_PREFIX_RE = re.compile(r"Project\s+\d+:")
+_COURSE_STRUCTURE_RE = re.compile(
+    r"^## Course Structure$.*?(?=^## |\Z)", re.MULTILINE | re.DOTALL
+)
+_INTRO_ROW_RE = re.compile(r"\|\s*\*\*(.+?)\*\*\s*\|")
+
+# {download}`label <path>` targets (matched at a {download} position)
+_DOWNLOAD_TARGET_RE = re.compile(r"\{download\}`[^<]*<([^>]+)>`")
+
+# Raw GitHub URL used to import a workflow
+RAW_WORKFLOW_URL = (
+    "raw.githubusercontent.com/ezponda/ai-agents-course/"
+    "main/courses/n8n_no_code/book/_static/workflows/"
+)
+
+# Every marker index_page() looks for, in one alternation: group 1 is the
+# full text of a {download}`…`, group 2 what follows a raw workflow URL.
+_PAGE_MARKER_RE = re.compile(
+    r"\{download\}`(?=([^`]*)`)"
+    r"|" + re.escape(RAW_WORKFLOW_URL) + r"(?=(\S*))"
+)
+
+# Bold prompt header ending where the text is cut off (endpos): the name,
+# then an optional " — subtitle" and an optional " (note)"
+_PROMPT_HEADER_RE = re.compile(
+    r"\*\*([^*]+?)(?:\s*—\s*[^*]+)?(?:\s*\([^)]+\))?\Z"
+)
+# The whole header + fenced block; only needed when a "(" left open before
+# a header's ":**" could make the note run on past that block
+_PROMPT_BLOCK_RE = re.compile(
+    r"\*\*([^*]+?)(?:\s*—\s*[^*]+)?(?:\s*\([^)]+\))?:\*\*"
+    r"\s*\n```\n(.*?)\n```",
+    re.DOTALL,
+)
+
+# Workflow JSON content
+_STICKY_URL_RE = re.compile(
+    r"https://ezponda\.github\.io/ai-agents-course/([^)\s\"#]+)"
+    r"(?:#([^)\s\"]*))?"
+)
+_DEPRECATED_NODE_RE = re.compile(rb"\$node\['[^']+'\]")  # bytes: run on raw file
+
+# Anchor ids in built HTML pages
+_HTML_ID_RE = re.compile(r'id="([^"]+)"')
+
+# External URLs
+_URL_RE = re.compile(r"https://[^\s\"\'\)\]\\>`]+")
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 _page_cache: dict[str, str] = {}
+_workflow_cache: dict[str, object] = {}
+
+
+def list_dir(directory: Path, suffix: str) -> list[os.DirEntry]:
+    """Return files in *directory* ending with *suffix*, sorted by name.
+
+    A missing directory yields an empty list.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = [e for e in it if e.name.endswith(suffix) and e.is_file()]
+    except FileNotFoundError:
+        return []
+    return sorted(entries, key=lambda e: e.name)
+
+
+@functools.lru_cache(maxsize=None)
+def scan_pages() -> list[os.DirEntry]:
+    """Course pages in BOOK_DIR.  Listed once per run."""
+    return list_dir(BOOK_DIR, ".md")
+
+
+@functools.lru_cache(maxsize=None)
+def scan_workflows() -> list[os.DirEntry]:
+    """Non-archived workflow JSONs in WORKFLOWS_DIR.  Listed once per run."""
+    return [
+        e for e in list_dir(WORKFLOWS_DIR, ".json") if "_archive" not in e.name
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _page_names() -> frozenset[str]:
+    return frozenset(e.name for e in scan_pages())
+
+
+@functools.lru_cache(maxsize=None)
+def path_exists(path: str | Path) -> bool:
+    """os.path.exists, stat-ing each path at most once per run."""
+    return os.path.exists(path)
+
+
+def page_exists(name: str) -> bool:
+    """Whether BOOK_DIR/name exists, answered from the directory snapshot.
+
+    Names not in the snapshot (e.g. in a subdirectory) fall back to a stat.
+    """
+    return name in _page_names() or path_exists(BOOK_DIR / name)
+
+
+def thread_map(fn, items: list, max_workers: int = MAX_WORKERS) -> list:
+    """Return [fn(item) for item in items], run on a small thread pool."""
+    if len(items) < 2:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as ex:
+        return list(ex.map(fn, items))
 
 
-def read_page(path: Path) -> str:
+def print_lines(prefix: str, items) -> None:
+    """Print prefix + item for every item, as one write."""
+    print("\n".join(f"{prefix}{item}" for item in items))
+
+
+def report_result(issue_count: int) -> int:
+    """Print the final verdict and return the exit code."""
+    print("\n" + "=" * 60)
+    if issue_count:
+        print(f"FAILED: {issue_count} issue(s) found")
+        return 1
+    else:
+        print("PASSED: No issues found")
+        return 0
+
+
+def load_json(path: str | Path):
+    """Parse a JSON file, using orjson when it is installed."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_text(path: str | Path) -> str:
+    """Read a UTF-8 file in binary mode and decode it in one step.
+
+    Newlines are translated the way text mode would translate them.
+    """
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_page(path: str | Path) -> str:
     """Read a MyST .md course page and return its text.  Results are cached."""
     key = str(path)
     if key not in _page_cache:
-        with open(path, "r", encoding="utf-8") as f:
-            _page_cache[key] = f.read()
+        _page_cache[key] = read_text(path)
     return _page_cache[key]
 
 
-def find_json_references(content: str) -> list[str]:
-    """Extract .json filenames from content."""
-    pattern = r'[\`\[\(> /]([a-zA-Z0-9][a-zA-Z0-9_]*\.json)[\`\]\) \n,]'
-    return list(set(re.findall(pattern, content)))
+def read_workflow(path: str | Path):
+    """Parse a workflow JSON file.  Results are cached."""
+    key = str(path)
+    if key not in _workflow_cache:
+        _workflow_cache[key] = load_json(path)
+    return _workflow_cache[key]
+
+
+# Characters allowed in / around a referenced workflow filename.
+_JSON_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+_JSON_REF_BEFORE = frozenset("`[(> /")
+_JSON_REF_AFTER = frozenset("`]) \n,")
+
+
+def load_workflows(workflows: list[os.DirEntry]) -> dict[str, object]:
+    """Parse every workflow JSON once, on a thread pool.
+
+    Maps filename → parsed data, or → the exception raised while loading it.
+    """
+    def load(entry: os.DirEntry):
+        try:
+            return read_workflow(entry.path)
+        except Exception as e:
+            return e
+
+    return dict(zip([e.name for e in workflows], thread_map(load, workflows)))
+
+
+class PageIndex(NamedTuple):
+    """What the checks look up in a course page, extracted in one pass."""
+
+    title: str | None  # leading "# Title" text
+    json_refs: frozenset[str]  # workflow filenames referenced anywhere
+    download_spans: list[str]  # text inside each {download}`…`
+    download_targets: list[str]  # <path> of each {download}`label <path>`
+    raw_url_tails: list[str]  # text after each raw workflow URL prefix
+    has_hammer: bool  # has a build-from-scratch dropdown (🛠️)
+
+
+_index_cache: dict[str, PageIndex] = {}
+
+
+def index_page(path: str | Path) -> PageIndex:
+    """Scan a course page once for everything checks 1 and 4-8 need."""
+    key = str(path)
+    if key not in _index_cache:
+        text = read_page(path)
+        spans: list[str] = []
+        targets: list[str] = []
+        tails: list[str] = []
+        target_end = 0  # targets don't overlap: skip {download}s inside one
+        for m in _PAGE_MARKER_RE.finditer(text):
+            span, tail = m.groups()
+            if tail is not None:
+                tails.append(tail)
+                continue
+            spans.append(span)
+            if m.start() >= target_end:
+                target = _DOWNLOAD_TARGET_RE.match(text, m.start())
+                if target:
+                    targets.append(target.group(1))
+                    target_end = target.end()
+        title = _PAGE_TITLE_RE.match(text)
+        _index_cache[key] = PageIndex(
+            title=title.group(1).strip() if title else None,
+            json_refs=find_json_references(text),
+            download_spans=spans,
+            download_targets=targets,
+            raw_url_tails=tails,
+            has_hammer="🛠️" in text,
+        )
+    return _index_cache[key]
+
+
+def page_title(path: str | Path) -> str | None:
+    """Return the page's leading "# Title" text, or None if it has none."""
+    return index_page(path).title
+
+
+def find_json_references(content: str) -> frozenset[str]:
+    """Extract .json filenames from content.
+
+    Splits on the literal ".json" and walks back from each split point to
+    the start of the filename, instead of running a regex over the page.
+    """
+    refs: set[str] = set()
+    if ".json" not in content:
+        return frozenset()
+    chunks = content.split(".json")
+    for chunk, following in zip(chunks, chunks[1:]):
+        if not following or following[0] not in _JSON_REF_AFTER:
+            continue
+        start = len(chunk)
+        while start > 0 and chunk[start - 1] in _JSON_NAME_CHARS:
+            start -= 1
+        name = chunk[start:]
+        if not name or name[0] == "_":
+            continue
+        if start == 0 or chunk[start - 1] not in _JSON_REF_BEFORE:
+            continue
+        refs.add(name + ".json")
+    return frozenset(refs)
 
 
 # ---------------------------------------------------------------------------
 # Check 1 — course page JSON references
 # ---------------------------------------------------------------------------
-def check_notebooks():
-    """Check all course pages for broken JSON references."""
+def check_notebooks(pages: list[os.DirEntry], available: set[str]):
+    """Check all course pages for broken JSON references.
+
+    *available* is the set of workflow filenames present on disk.
+    """
     issues = []
 
-    if not BOOK_DIR.exists():
-        print(f"  Warning: Book directory not found: {BOOK_DIR}")
+    if not pages:
+        print(f"  Warning: No course pages found in {BOOK_DIR}")
         return issues
 
-    for page_path in sorted(BOOK_DIR.glob("*.md")):
+    def scan(entry: os.DirEntry):
         try:
-            content = read_page(page_path)
+            return index_page(entry.path).json_refs, None
         except Exception as e:
-            issues.append(f"Could not read {page_path.name}: {e}")
+            return frozenset(), e
+
+    # Read and scan pages in parallel; report in sorted page order
+    for entry, (json_refs, error) in zip(pages, thread_map(scan, pages)):
+        if error is not None:
+            issues.append(f"Could not read {entry.name}: {error}")
             continue
 
-        json_refs = find_json_references(content)
         for json_file in json_refs:
-            json_path = WORKFLOWS_DIR / json_file
-            if not json_path.exists():
+            if json_file not in available:
                 issues.append(
-                    f"{page_path.name}: References missing file '{json_file}'"
+                    f"{entry.name}: References missing file '{json_file}'"
                 )
 
     return issues
@@ -85,45 +380,51 @@ def check_notebooks():
 # ---------------------------------------------------------------------------
 # Check 2 — workflow JSON validity
 # ---------------------------------------------------------------------------
-def check_workflow_files():
-    """Check that workflow JSON files are valid."""
+def check_workflow_files(
+    workflows: list[os.DirEntry], loaded: dict[str, object]
+):
+    """Check that workflow JSON files are valid.
+
+    *loaded* is the result of load_workflows().  Returns (issues, parsed)
+    where *parsed* maps filename → workflow dict for every file that loaded.
+    """
     issues = []
+    parsed: dict[str, dict] = {}
 
-    if not WORKFLOWS_DIR.exists():
-        print(f"  Warning: Workflows directory not found: {WORKFLOWS_DIR}")
-        return issues
+    if not workflows:
+        print(f"  Warning: No workflow files found in {WORKFLOWS_DIR}")
+        return issues, parsed
 
-    for json_path in sorted(WORKFLOWS_DIR.glob("*.json")):
-        if "_archive" in str(json_path):
+    for entry in workflows:
+        data = loaded[entry.name]
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        if isinstance(data, json.JSONDecodeError):
+            issues.append(f"{entry.name}: Invalid JSON - {data}")
+            continue
+        if isinstance(data, Exception):
+            issues.append(f"{entry.name}: Could not read - {data}")
             continue
         try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if "nodes" not in data:
-                issues.append(
-                    f"{json_path.name}: Missing 'nodes' key "
-                    "(may not be valid n8n workflow)"
-                )
-        except json.JSONDecodeError as e:
-            issues.append(f"{json_path.name}: Invalid JSON - {e}")
-        except Exception as e:
-            issues.append(f"{json_path.name}: Could not read - {e}")
+            has_nodes = "nodes" in data
+        except TypeError as e:  # a bare number or null
+            issues.append(f"{entry.name}: Could not read - {e}")
+            continue
+        parsed[entry.name] = data
+        if not has_nodes:
+            issues.append(
+                f"{entry.name}: Missing 'nodes' key "
+                "(may not be valid n8n workflow)"
+            )
 
-    return issues
+    return issues, parsed
 
 
 # ---------------------------------------------------------------------------
 # Check 3 — prompt consistency
 # ---------------------------------------------------------------------------
-def extract_prompts_from_workflow(json_path: Path) -> dict[str, str]:
-    """Extract system messages and prompts from a workflow JSON."""
+def extract_prompts_from_workflow(data: dict) -> dict[str, str]:
+    """Extract system messages and prompts from a parsed workflow JSON."""
     prompts = {}
-    try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception:
-        return prompts
-
     for node in data.get("nodes", []):
         node_name = node.get("name", "Unknown")
         params = node.get("parameters", {})
@@ -145,6 +446,59 @@ def extract_prompts_from_workflow(json_path: Path) -> dict[str, str]:
     return prompts
 
 
+def iter_prompt_blocks(source: str):
+    """Yield (name, code) for each "**Name:**" header followed by a code fence.
+
+    Walks the bare "```" fences left to right.  For each one preceded by
+    ":**", _PROMPT_HEADER_RE is matched against the text just before it.
+    A header has no "*" outside a trailing "(note)", so the search starts
+    at the last "*" ahead of that note's "(" rather than at the previous
+    block.  Gives the same matches as _PROMPT_BLOCK_RE.finditer, which is
+    used directly only for the rare unclosed "(" before a header.
+    """
+    pos = 0  # end of the previous block; headers can't start before it
+    fence = source.find("\n```\n")
+    while fence != -1:
+        close = source.find("\n```", fence + 5)
+        if close == -1:
+            return
+
+        # Header must end in ":**" with only whitespace before the fence
+        end = fence
+        while end > pos and source[end - 1].isspace():
+            end -= 1
+        header_end = end - 3
+        if header_end > pos and source.startswith(":**", header_end):
+            # An unclosed "(" here could be a note that ends after this
+            # block; let the full pattern decide where the match is
+            opened = max(source.rfind(")", pos, header_end) + 1, pos)
+            if source.find("(", opened, header_end) != -1:
+                m = _PROMPT_BLOCK_RE.search(source, pos)
+                if not m:
+                    return
+                yield m.group(1), m.group(2)
+                pos = m.end()
+                fence = source.find("\n```\n", pos)
+                continue
+
+            # Stars may only appear after the "(" of a trailing "(note)";
+            # that "(" comes after the last ")" inside the header
+            limit = header_end
+            if source[header_end - 1] == ")":
+                inner = source.rfind(")", pos, header_end - 1)
+                paren = source.find("(", max(inner + 1, pos), header_end - 2)
+                if paren != -1:
+                    limit = paren
+            star = source.rfind("*", pos, limit)
+            m = _PROMPT_HEADER_RE.search(source, max(pos, star - 1), header_end)
+            if m:
+                yield m.group(1), source[fence + 5:close]
+                pos = close + 4
+                fence = source.find("\n```\n", pos)
+                continue
+        fence = source.find("\n```\n", fence + 1)
+
+
 def extract_prompts_from_notebook(page_path: Path) -> dict[str, str]:
     """Extract documented prompts from code blocks in a course page."""
     prompts = {}
@@ -153,13 +507,11 @@ def extract_prompts_from_notebook(page_path: Path) -> dict[str, str]:
     except Exception:
         return prompts
 
-    pattern = (
-        r'\*\*([^*]+?)(?:\s*—\s*[^*]+)?(?:\s*\([^)]+\))?:\*\*'
-        r'\s*\n```\n(.*?)\n```'
-    )
-    matches = re.findall(pattern, source, re.DOTALL)
+    # A prompt block needs a bold header and a code fence
+    if "**" not in source or "```" not in source:
+        return prompts
 
-    for name, content in matches:
+    for name, content in iter_prompt_blocks(source):
         name = name.strip()
         content = content.strip()
         if content.startswith("{") or content.startswith("https://") or "INPUT" in content:
@@ -171,89 +523,112 @@ def extract_prompts_from_notebook(page_path: Path) -> dict[str, str]:
     return prompts
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_prompt(text: str) -> str:
     """Normalize a prompt for comparison."""
     text = text.strip()
     if text.startswith("="):
         text = text[1:]
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"^System:\s*", "", text)
+    text = " ".join(text.split())
+    if text.startswith("System:"):
+        text = text[len("System:"):].lstrip()
     return text.lower()
 
 
 # Map of course pages → workflow files they document
 NOTEBOOK_WORKFLOW_MAP = {
-    "04a_prompt_chaining.md": ["01_prompt_chaining.json"],
-    "04b_routing.md": ["02_routing.json"],
-    "04c_parallelization.md": ["03_parallelization.json"],
-    "04d_human_in_the_loop.md": ["04_human_in_the_loop.json"],
-    "06_first_ai_agent.md": [
+    "04a_prompt_chaining.md": ("01_prompt_chaining.json",),
+    "04b_routing.md": ("02_routing.json",),
+    "04c_parallelization.md": ("03_parallelization.json",),
+    "04d_human_in_the_loop.md": ("04_human_in_the_loop.json",),
+    "06_first_ai_agent.md": (
         "05_ai_agent_basics_calculator_memory.json",
         "06_ai_agent_tools_serpapi_calculator.json",
         "07_ai_agent_chat_trigger_memory.json",
-    ],
-    "appendix_d_prompt_engineering.md": [
+    ),
+    "appendix_d_prompt_engineering.md": (
         "08_prompt_engineering_comparison.json",
-    ],
-    "project_1_recipe_assistant.md": [
+    ),
+    "project_1_recipe_assistant.md": (
         "10_recipe_assistant.json",
-    ],
-    "appendix_b_going_live.md": [
+    ),
+    "appendix_b_going_live.md": (
         "going_live_schedule.json",
         "going_live_webhook.json",
         "going_live_error.json",
-    ],
-    "project_2_ask_your_data.md": [
+    ),
+    "project_2_ask_your_data.md": (
         "11_ask_your_data.json",
-    ],
-    "09_rag.md": [
+    ),
+    "09_rag.md": (
         "14_rag_faq_bot.json",
-    ],
-    "10_multi_agent_systems.md": [
+    ),
+    "10_multi_agent_systems.md": (
         "15_multi_agent_content_pipeline.json",
-    ],
-    "project_6_connect_your_app.md": [
+    ),
+    "project_6_connect_your_app.md": (
         "16_connect_your_app.json",
-    ],
-    "project_7_salon_booking_assistant.md": [
+    ),
+    "project_7_salon_booking_assistant.md": (
         "17_salon_booking_multiagent.json",
-    ],
+    ),
+}
+
+# Reverse map: workflow file → the page that documents it
+WORKFLOW_TO_NOTEBOOK = {
+    wf: nb for nb, wfs in NOTEBOOK_WORKFLOW_MAP.items() for wf in wfs
 }
 
 
-def check_prompt_consistency():
+def check_prompt_consistency(parsed_workflows: dict[str, dict]):
     """Check that prompts in course pages match workflow JSONs."""
     issues = []
     warnings = []
+    # (workflow file, prompt key) → word set, reused if a workflow is
+    # documented by more than one page
+    wf_token_cache: dict[tuple[str, str], frozenset[str]] = {}
 
     for notebook_name, workflow_files in NOTEBOOK_WORKFLOW_MAP.items():
-        notebook_path = BOOK_DIR / notebook_name
-        if not notebook_path.exists():
+        if not page_exists(notebook_name):
             continue
+        notebook_path = BOOK_DIR / notebook_name
 
         notebook_prompts = extract_prompts_from_notebook(notebook_path)
+        # Inverted index: word -> ids of documented prompts containing it
+        word_index: dict[str, list[int]] = defaultdict(list)
+        largest_nb = 0  # most distinct words in any documented prompt
+        for nb_id, nb_prompt in enumerate(notebook_prompts.values()):
+            nb_words = set(normalize_prompt(nb_prompt).split())
+            largest_nb = max(largest_nb, len(nb_words))
+            for word in nb_words:
+                word_index[word].append(nb_id)
 
         for workflow_file in workflow_files:
-            workflow_path = WORKFLOWS_DIR / workflow_file
-            if not workflow_path.exists():
+            data = parsed_workflows.get(workflow_file)
+            if data is None:
                 continue
 
-            workflow_prompts = extract_prompts_from_workflow(workflow_path)
+            workflow_prompts = extract_prompts_from_workflow(data)
 
             for wf_key, wf_prompt in workflow_prompts.items():
-                wf_normalized = normalize_prompt(wf_prompt)
+                cache_key = (workflow_file, wf_key)
+                wf_words = wf_token_cache.get(cache_key)
+                if wf_words is None:
+                    wf_words = frozenset(normalize_prompt(wf_prompt).split())
+                    wf_token_cache[cache_key] = wf_words
+
+                # Match if any documented prompt shares > 60 % of the words
+                # (integer form of hits / len(wf_words) > 0.6).  Skip the
+                # count when no documented prompt is big enough to get there.
+                wf_len = len(wf_words)
                 found_match = False
-
-                for _nb_key, nb_prompt in notebook_prompts.items():
-                    nb_normalized = normalize_prompt(nb_prompt)
-                    wf_words = set(wf_normalized.split())
-                    nb_words = set(nb_normalized.split())
-
-                    if len(wf_words) > 0:
-                        overlap = len(wf_words & nb_words) / len(wf_words)
-                        if overlap > 0.6:
-                            found_match = True
-                            break
+                if largest_nb * 10 > wf_len * 6:
+                    hits: Counter[int] = Counter()
+                    for word in wf_words:
+                        hits.update(word_index.get(word, ()))
+                    found_match = any(
+                        n * 10 > wf_len * 6 for n in hits.values()
+                    )
 
                 if not found_match and "systemMessage" in wf_key:
                     node_name = wf_key.replace(" (systemMessage)", "")
@@ -268,23 +643,18 @@ def check_prompt_consistency():
 # ---------------------------------------------------------------------------
 # Check 4 — referenced vs available
 # ---------------------------------------------------------------------------
-def list_referenced_vs_available():
+def list_referenced_vs_available(
+    pages: list[os.DirEntry], workflows: list[os.DirEntry]
+):
     """Show which workflows are referenced and which exist."""
-    available: set[str] = set()
-    if WORKFLOWS_DIR.exists():
-        for p in WORKFLOWS_DIR.glob("*.json"):
-            if "_archive" not in str(p):
-                available.add(p.name)
+    available: set[str] = {entry.name for entry in workflows}
 
     referenced: set[str] = set()
-    if BOOK_DIR.exists():
-        for notebook_path in BOOK_DIR.glob("*.md"):
-            try:
-                with open(notebook_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                referenced.update(find_json_references(content))
-            except Exception:
-                pass
+    for entry in pages:
+        try:
+            referenced.update(index_page(entry.path).json_refs)
+        except Exception:
+            pass
 
     return available, referenced
 
@@ -292,25 +662,58 @@ def list_referenced_vs_available():
 # ---------------------------------------------------------------------------
 # Check 5 — TOC ↔ intro table sync
 # ---------------------------------------------------------------------------
-def _parse_toc() -> dict[str, list[str]]:
+@functools.lru_cache(maxsize=None)
+def _parse_toc() -> dict[str, list[str]] | None:
     """Return {section_caption: [file_stem, ...]} from _toc.yml.
 
-    Only collects chapter-level files (indented ≤ 6 spaces), not section
-    sub-pages which appear in the sidebar automatically.
+    Only collects chapter-level files, not section sub-pages which appear
+    in the sidebar automatically.  Cached: checks 5 and 6 both need it.
+    Returns None if PyYAML cannot make sense of the file.
     """
     toc_path = BOOK_DIR / "_toc.yml"
+    if yaml is None:
+        return _parse_toc_lines(toc_path)
+
+    try:
+        with open(toc_path, "rb") as f:
+            toc = yaml.load(f, Loader=_YAML_LOADER)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(toc, dict):  # empty file, or not a mapping
+        return None
+
+    sections: dict[str, list[str]] = {}
+    try:
+        for part in toc.get("parts", []):
+            if "caption" not in part:
+                continue
+            sections[str(part["caption"]).strip()] = [
+                str(chapter["file"]).strip()
+                for chapter in part.get("chapters", [])
+                if "file" in chapter
+            ]
+    except (AttributeError, KeyError, TypeError):  # unexpected shape
+        return None
+    return sections
+
+
+def _parse_toc_lines(toc_path: Path) -> dict[str, list[str]]:
+    """Line-based _toc.yml parser, used when PyYAML is not installed.
+
+    Chapter-level files are the ones indented ≤ 6 spaces.
+    """
     sections: dict[str, list[str]] = {}
     current_caption: str | None = None
     with open(toc_path, "r", encoding="utf-8") as f:
         for line in f:
-            cap_match = re.match(r"\s*-\s*caption:\s*(.+)", line)
+            cap_match = _TOC_CAPTION_RE.match(line)
             if cap_match:
                 current_caption = cap_match.group(1).strip()
                 sections[current_caption] = []
                 continue
             # Only match chapter-level files (≤ 6 leading spaces), skip
             # deeper "sections:" entries which are sub-pages.
-            file_match = re.match(r"(\s*)-\s*file:\s*(.+)", line)
+            file_match = _TOC_FILE_RE.match(line)
             if file_match and current_caption is not None:
                 indent = len(file_match.group(1))
                 if indent <= 6:
@@ -327,9 +730,10 @@ def _parse_intro_table() -> dict[str, list[str]]:
     intro_text = read_page(intro_path)
 
     # Slice out the "## Course Structure" section (up to the next ## heading)
+    if "## Course Structure" not in intro_text:
+        return {}
     structure_text = ""
-    m = re.search(r"^## Course Structure$.*?(?=^## |\Z)", intro_text,
-                  re.MULTILINE | re.DOTALL)
+    m = _COURSE_STRUCTURE_RE.search(intro_text)
     if m:
         structure_text = m.group(0)
 
@@ -337,21 +741,17 @@ def _parse_intro_table() -> dict[str, list[str]]:
         return {}
 
     # Build a map from readable title → file stem using TOC + page titles
-    toc_sections = _parse_toc()
+    toc_sections = _parse_toc() or {}
     title_to_stem: dict[str, str] = {}
     for _section, stems in toc_sections.items():
         for stem in stems:
             nb_path = BOOK_DIR / f"{stem}.md"
-            if nb_path.exists():
+            if page_exists(f"{stem}.md"):
                 try:
-                    md = read_page(nb_path)
-                    m = re.match(r"#\s+(.+)", md)
-                    if m:
-                        raw_title = m.group(1).strip()
+                    raw_title = page_title(nb_path)
+                    if raw_title is not None:
                         # Strip prefix like "Appendix A: " or "Project 1: "
-                        cleaned = re.sub(
-                            r"^(?:Appendix\s+[A-Z]:\s*|Project\s+\d+:\s*)", "", raw_title
-                        )
+                        cleaned = _TITLE_PREFIX_RE.sub("", raw_title)
                         title_to_stem[cleaned.lower()] = stem
                         title_to_stem[raw_title.lower()] = stem
                 except Exception:
@@ -361,29 +761,24 @@ def _parse_intro_table() -> dict[str, list[str]]:
     sections: dict[str, list[str]] = {"Course": [], "Projects": [], "Appendices": []}
     current_section: str | None = None
     for line in structure_text.splitlines():
-        if line.strip().startswith("### Course"):
-            current_section = "Course"
-            continue
-        if line.strip().startswith("### Projects"):
-            current_section = "Projects"
-            continue
-        if line.strip().startswith("### Appendices"):
-            current_section = "Appendices"
-            continue
-
-        if current_section is None:
+        stripped = line.strip()
+        if stripped.startswith("### "):
+            for name in sections:
+                if stripped.startswith(f"### {name}"):
+                    current_section = name
+                    break
             continue
 
         # Table row: | **Title** | description |
-        row_match = re.match(r"\|\s*\*\*(.+?)\*\*\s*\|", line)
+        if current_section is None or not line.startswith("|"):
+            continue
+        row_match = _INTRO_ROW_RE.match(line)
         if not row_match:
             continue
 
         title_text = row_match.group(1).strip()
         # Strip "Appendix X: " or "Project N: " prefix for lookup
-        cleaned = re.sub(
-            r"^(?:Appendix\s+[A-Z]:\s*|Project\s+\d+:\s*)", "", title_text
-        )
+        cleaned = _TITLE_PREFIX_RE.sub("", title_text)
         key = cleaned.lower()
 
         stem = title_to_stem.get(key) or title_to_stem.get(title_text.lower())
@@ -407,11 +802,14 @@ def check_toc_sync():
 
     toc_path = BOOK_DIR / "_toc.yml"
     intro_path = BOOK_DIR / "00_introduction.md"
-    if not toc_path.exists() or not intro_path.exists():
+    if not path_exists(toc_path) or not page_exists(intro_path.name):
         issues.append("Missing _toc.yml or 00_introduction.md")
         return issues
 
     toc_sections = _parse_toc()
+    if toc_sections is None:
+        issues.append("Could not parse _toc.yml")
+        return issues
     intro_sections = _parse_intro_table()
 
     if not intro_sections:
@@ -427,18 +825,23 @@ def check_toc_sync():
 
     for caption, intro_key in caption_map.items():
         toc_files = set(toc_sections.get(caption, []))
-        intro_files = set(intro_sections.get(intro_key, []))
         # Filter out unresolved entries
-        intro_files = {f for f in intro_files if not f.startswith("??")}
-
-        in_toc_not_intro = toc_files - intro_files
-        in_intro_not_toc = intro_files - toc_files
-
-        for f in sorted(in_toc_not_intro):
+        intro_files = {
+            f for f in intro_sections.get(intro_key, [])
+            if not f.startswith("??")
+        }
+
+        # One pass over the stems that appear on only one side
+        in_toc_not_intro: list[str] = []
+        in_intro_not_toc: list[str] = []
+        for f in sorted(toc_files ^ intro_files):
+            (in_toc_not_intro if f in toc_files else in_intro_not_toc).append(f)
+
+        for f in in_toc_not_intro:
             issues.append(
                 f"'{f}' is in _toc.yml ({caption}) but missing from intro table"
             )
-        for f in sorted(in_intro_not_toc):
+        for f in in_intro_not_toc:
             issues.append(
                 f"'{f}' is in intro table ({intro_key}) but missing from _toc.yml"
             )
@@ -454,18 +857,21 @@ def check_title_patterns():
     issues: list[str] = []
     warnings: list[str] = []
 
-    toc_sections = _parse_toc()
+    toc_sections = _parse_toc() or {}
 
     # --- Appendices: must be "# Appendix [A-Z]: ..." in sequential order ---
     appendix_stems = toc_sections.get("Appendices", [])
     expected_letter = ord("A")
     for stem in appendix_stems:
         nb_path = BOOK_DIR / f"{stem}.md"
-        if not nb_path.exists():
+        if not page_exists(f"{stem}.md"):
             issues.append(f"{stem}.md: file not found")
             continue
-        md = read_page(nb_path)
-        m = re.match(r"#\s+Appendix\s+([A-Z]):\s+", md)
+        # Cheap prefix test first; the regex only runs on likely matches
+        title = page_title(nb_path) or ""
+        m = None
+        if title.startswith("Appendix"):
+            m = _APPENDIX_TITLE_RE.match(read_page(nb_path))
         if not m:
             issues.append(
                 f"{stem}.md: title must match '# Appendix [A-Z]: ...'"
@@ -484,11 +890,13 @@ def check_title_patterns():
     expected_num = 1
     for stem in project_stems:
         nb_path = BOOK_DIR / f"{stem}.md"
-        if not nb_path.exists():
+        if not page_exists(f"{stem}.md"):
             issues.append(f"{stem}.md: file not found")
             continue
-        md = read_page(nb_path)
-        m = re.match(r"#\s+Project\s+(\d+):\s+", md)
+        title = page_title(nb_path) or ""
+        m = None
+        if title.startswith("Project"):
+            m = _PROJECT_TITLE_RE.match(read_page(nb_path))
         if not m:
             issues.append(
                 f"{stem}.md: title must match '# Project N: ...'"
@@ -506,17 +914,15 @@ def check_title_patterns():
     course_stems = toc_sections.get("Course", [])
     for stem in course_stems:
         nb_path = BOOK_DIR / f"{stem}.md"
-        if not nb_path.exists():
+        if not page_exists(f"{stem}.md"):
             continue
-        md = read_page(nb_path)
-        m = re.match(r"#\s+(.+)", md)
-        if m:
-            title = m.group(1).strip()
-            if re.match(r"Appendix\s+[A-Z]:", title):
+        title = page_title(nb_path)
+        if title is not None:
+            if title.startswith("Appendix") and _APPENDIX_PREFIX_RE.match(title):
                 warnings.append(
                     f"{stem}.md: course chapter has 'Appendix' prefix"
                 )
-            if re.match(r"Project\s+\d+:", title):
+            if title.startswith("Project") and _PROJECT_PREFIX_RE.match(title):
                 warnings.append(
                     f"{stem}.md: course chapter has 'Project' prefix"
                 )
@@ -534,38 +940,40 @@ def check_notebook_structure():
 
     for notebook_name, workflow_files in NOTEBOOK_WORKFLOW_MAP.items():
         nb_path = BOOK_DIR / notebook_name
-        if not nb_path.exists():
+        if not page_exists(notebook_name):
             continue
 
         try:
-            md = read_page(nb_path)
+            index = index_page(nb_path)
         except Exception:
             issues.append(f"{notebook_name}: could not read page")
             continue
 
+        # File each import URL points at: its text up to the first ".json".
+        # A tail starts with wf_file exactly when this equals wf_file,
+        # since ".json" only appears at the end of workflow filenames.
+        url_files = {
+            tail[:i + 5]
+            for tail in index.raw_url_tails
+            if (i := tail.find(".json")) >= 0
+        }
+
         for wf_file in workflow_files:
             # Import URL
-            raw_url_fragment = (
-                f"raw.githubusercontent.com/ezponda/ai-agents-course/"
-                f"main/courses/n8n_no_code/book/_static/workflows/{wf_file}"
-            )
-            if raw_url_fragment not in md:
+            if wf_file not in url_files:
                 issues.append(
                     f"{notebook_name}: missing import URL for {wf_file}"
                 )
 
             # Download directive
-            download_pattern = (
-                r"\{download\}`[^`]*" + re.escape(wf_file) + r"[^`]*`"
-            )
-            if not re.search(download_pattern, md):
+            if not any(wf_file in span for span in index.download_spans):
                 issues.append(
                     f"{notebook_name}: missing {{download}} directive for {wf_file}"
                 )
 
         # Build-from-scratch dropdown (🛠️)
         # Appendix notebooks may legitimately skip this, so warn rather than error
-        if "🛠️" not in md:
+        if not index.has_hammer:
             warnings.append(
                 f"{notebook_name}: missing build-from-scratch dropdown (🛠️)"
             )
@@ -576,28 +984,21 @@ def check_notebook_structure():
 # ---------------------------------------------------------------------------
 # Check 8 — {download} directives point to existing files
 # ---------------------------------------------------------------------------
-def check_download_directives():
+def check_download_directives(pages: list[os.DirEntry]):
     """Verify {download} directives resolve to existing files."""
     issues: list[str] = []
 
-    if not BOOK_DIR.exists():
-        return issues
-
-    pattern = re.compile(r"\{download\}`[^<]*<([^>]+)>`")
-
-    for nb_path in sorted(BOOK_DIR.glob("*.md")):
+    for entry in pages:
         try:
-            with open(nb_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            download_targets = index_page(entry.path).download_targets
         except Exception:
             continue
 
-        for m in pattern.finditer(content):
-            rel_path = m.group(1)
+        for rel_path in download_targets:
             target = (BOOK_DIR / rel_path).resolve()
-            if not target.exists():
+            if not path_exists(target):
                 issues.append(
-                    f"{nb_path.name}: {{download}} target not found: {rel_path}"
+                    f"{entry.name}: {{download}} target not found: {rel_path}"
                 )
 
     return issues
@@ -606,27 +1007,33 @@ def check_download_directives():
 # ---------------------------------------------------------------------------
 # Check 9 — sticky notes in workflow JSONs
 # ---------------------------------------------------------------------------
-def check_sticky_notes():
-    """Verify sticky note URLs in workflow JSONs."""
+@functools.lru_cache(maxsize=None)
+def built_html_ids(page_part: str) -> frozenset[str] | None:
+    """Return the id="…" anchors in a built HTML page, or None if unreadable."""
+    html_file = BOOK_DIR / "_build" / "html" / page_part
+    try:
+        html_content = read_text(html_file)
+    except Exception:
+        return None
+    return frozenset(_HTML_ID_RE.findall(html_content))
+
+
+def check_sticky_notes(
+    workflows: list[os.DirEntry], loaded: dict[str, object]
+):
+    """Verify sticky note URLs in workflow JSONs (*loaded*: load_workflows())."""
     issues: list[str] = []
     warnings: list[str] = []
 
-    if not WORKFLOWS_DIR.exists():
-        return issues, warnings
-
-    build_html = BOOK_DIR / "_build" / "html"
+    has_build = path_exists(BOOK_DIR / "_build" / "html")
 
-    for json_path in sorted(WORKFLOWS_DIR.glob("*.json")):
-        if "_archive" in str(json_path):
-            continue
+    for entry in workflows:
         # Skip screenshot helper workflows
-        if "00_screenshot" in json_path.name:
+        if "00_screenshot" in entry.name:
             continue
 
-        try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception:
+        data = loaded[entry.name]
+        if isinstance(data, Exception):
             continue
 
         nodes = data.get("nodes", [])
@@ -639,11 +1046,7 @@ def check_sticky_notes():
         found_course_url = False
         for sn in sticky_nodes:
             content = sn.get("parameters", {}).get("content", "")
-            url_match = re.search(
-                r"https://ezponda\.github\.io/ai-agents-course/([^)\s\"#]+)"
-                r"(?:#([^)\s\"]*))?",
-                content,
-            )
+            url_match = _STICKY_URL_RE.search(content)
             if not url_match:
                 continue
 
@@ -654,30 +1057,34 @@ def check_sticky_notes():
             # Check page corresponds to a notebook
             if page_part.endswith(".html"):
                 stem = page_part[:-5]  # strip .html
-                nb_file = BOOK_DIR / f"{stem}.md"
-                if not nb_file.exists():
+                if not page_exists(f"{stem}.md"):
+                    # Point at the documenting page, if it is another one
+                    # that does exist
+                    expected = WORKFLOW_TO_NOTEBOOK.get(entry.name)
+                    hint = ""
+                    if (
+                        expected
+                        and expected != f"{stem}.md"
+                        and page_exists(expected)
+                    ):
+                        hint = f" (expected {expected})"
                     issues.append(
-                        f"{json_path.name}: sticky note URL references "
-                        f"'{stem}.md' which does not exist"
+                        f"{entry.name}: sticky note URL references "
+                        f"'{stem}.md' which does not exist{hint}"
                     )
 
             # If build exists, verify anchor
-            if fragment and build_html.exists():
-                html_file = build_html / page_part
-                if html_file.exists():
-                    try:
-                        html_content = html_file.read_text(encoding="utf-8")
-                        if f'id="{fragment}"' not in html_content:
-                            warnings.append(
-                                f"{json_path.name}: anchor '#{fragment}' "
-                                f"not found in built HTML {page_part}"
-                            )
-                    except Exception:
-                        pass
+            if fragment and has_build:
+                anchor_ids = built_html_ids(page_part)
+                if anchor_ids is not None and fragment not in anchor_ids:
+                    warnings.append(
+                        f"{entry.name}: anchor '#{fragment}' "
+                        f"not found in built HTML {page_part}"
+                    )
 
         if not found_course_url:
             issues.append(
-                f"{json_path.name}: no stickyNote with ezponda.github.io URL"
+                f"{entry.name}: no stickyNote with ezponda.github.io URL"
             )
 
     return issues, warnings
@@ -686,27 +1093,21 @@ def check_sticky_notes():
 # ---------------------------------------------------------------------------
 # Check 10 — deprecated $node['...'] syntax
 # ---------------------------------------------------------------------------
-def check_deprecated_syntax():
+def check_deprecated_syntax(workflows: list[os.DirEntry]):
     """Check for deprecated $node['...'] expressions in workflow JSONs.
 
     Modern syntax is $('Node Name').first().json.field
     """
     issues: list[str] = []
 
-    if not WORKFLOWS_DIR.exists():
-        return issues
-
-    pattern = re.compile(r"\$node\['[^']+'\]")
-
-    for json_path in sorted(WORKFLOWS_DIR.glob("*.json")):
-        if "_archive" in str(json_path):
-            continue
+    for entry in workflows:
         try:
-            content = json_path.read_text(encoding="utf-8")
-            matches = pattern.findall(content)
+            with open(entry.path, "rb") as f:
+                content = f.read()
+            matches = _DEPRECATED_NODE_RE.findall(content)
             if matches:
                 issues.append(
-                    f"{json_path.name}: uses deprecated $node['...'] syntax "
+                    f"{entry.name}: uses deprecated $node['...'] syntax "
                     f"({len(matches)} occurrence(s)) — use $('Node').first() instead"
                 )
         except Exception:
@@ -718,28 +1119,49 @@ def check_deprecated_syntax():
 # ---------------------------------------------------------------------------
 # Check 11 — external URL check (opt-in)
 # ---------------------------------------------------------------------------
-def check_external_urls():
-    """HEAD-request all external URLs found in notebooks."""
+def load_url_cache() -> dict[str, float]:
+    """Return {url: last OK timestamp} from URL_CACHE_PATH, or {} if unusable."""
+    try:
+        with open(URL_CACHE_PATH, "rb") as f:
+            cache = json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    return cache
+
+
+def save_url_cache(cache: dict[str, float]) -> None:
+    """Write the URL cache; failing to write it is not an error."""
+    try:
+        with open(URL_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=0, sort_keys=True)
+    except OSError:
+        pass
+
+
+def check_external_urls(pages: list[os.DirEntry]):
+    """HEAD-request all external URLs found in notebooks.
+
+    URLs that answered OK within URL_CACHE_TTL are not requested again.
+    """
     import urllib.request
     import urllib.error
 
     issues: list[str] = []
     warnings: list[str] = []
 
-    if not BOOK_DIR.exists():
-        return issues, warnings
-
     # Collect all URLs
-    url_pattern = re.compile(r"https://[^\s\"\'\)\]\\>`]+")
     all_urls: set[str] = set()
 
-    for nb_path in sorted(BOOK_DIR.glob("*.md")):
+    for entry in pages:
         try:
-            with open(nb_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = read_page(entry.path)
         except Exception:
             continue
-        for m in url_pattern.finditer(content):
+        if "https://" not in content:
+            continue
+        for m in _URL_RE.finditer(content):
             url = m.group(0).rstrip(".,;:")
             all_urls.add(url)
 
@@ -747,44 +1169,83 @@ def check_external_urls():
     skip_hosts = {"localhost", "127.0.0.1"}
     filtered: list[str] = []
     for url in sorted(all_urls):
-        host_match = re.match(r"https://([^/:]+)", url)
-        if host_match and host_match.group(1) in skip_hosts:
+        try:
+            host = urllib.parse.urlsplit(url).hostname
+        except ValueError:
+            host = None
+        if host in skip_hosts:
             continue
         filtered.append(url)
 
-    print(f"  Checking {len(filtered)} unique URLs...")
+    # Skip URLs that were reachable recently
+    now = time.time()
+    cache = {
+        url: checked for url, checked in load_url_cache().items()
+        if isinstance(checked, (int, float)) and now - checked < URL_CACHE_TTL
+    }
+    n_unique = len(filtered)
+    filtered = [url for url in filtered if url not in cache]
+
+    if n_unique > len(filtered):
+        print(
+            f"  Checking {len(filtered)} unique URLs "
+            f"({n_unique - len(filtered)} cached as reachable)..."
+        )
+    else:
+        print(f"  Checking {len(filtered)} unique URLs...")
+
+    def probe(url: str) -> tuple[str | None, str | None, bool]:
+        """Return (issue, warning, ok) for one URL.
 
-    for url in filtered:
+        issue and warning may be None.  ok is True only when a response
+        below 400 was actually received; only those URLs are cached.
+        """
         try:
             req = urllib.request.Request(url, method="HEAD")
             req.add_header("User-Agent", "n8n-course-checker/1.0")
-            resp = urllib.request.urlopen(req, timeout=5)
-            code = resp.getcode()
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                code = resp.getcode()
             if code and code >= 400:
-                warnings.append(f"HTTP {code}: {url}")
+                return None, f"HTTP {code}: {url}", False
+            return None, None, True
         except urllib.error.HTTPError as e:
             if e.code == 404:
-                issues.append(f"404 Not Found: {url}")
+                return f"404 Not Found: {url}", None, False
             elif e.code == 405:
                 # Method not allowed — try GET
                 try:
                     req2 = urllib.request.Request(url, method="GET")
                     req2.add_header("User-Agent", "n8n-course-checker/1.0")
-                    resp2 = urllib.request.urlopen(req2, timeout=5)
-                    code2 = resp2.getcode()
+                    with urllib.request.urlopen(req2, timeout=5) as resp2:
+                        code2 = resp2.getcode()
+                        # Read a small amount to avoid hanging
+                        resp2.read(1024)
                     if code2 and code2 >= 400:
-                        warnings.append(f"HTTP {code2}: {url}")
-                    # Read a small amount to avoid hanging
-                    resp2.read(1024)
-                    resp2.close()
+                        return None, f"HTTP {code2}: {url}", False
+                    return None, None, True
                 except Exception:
                     pass  # 405 is common, don't report if GET also fails
             else:
-                warnings.append(f"HTTP {e.code}: {url}")
+                return None, f"HTTP {e.code}: {url}", False
         except urllib.error.URLError as e:
-            warnings.append(f"Connection error: {url} ({e.reason})")
+            return None, f"Connection error: {url} ({e.reason})", False
         except Exception as e:
-            warnings.append(f"Error: {url} ({e})")
+            return None, f"Error: {url} ({e})", False
+        # HEAD gave 405 and GET failed: not reported, but not known good
+        return None, None, False
+
+    # Requests run concurrently; results come back in sorted URL order
+    for url, (issue, warning, ok) in zip(
+        filtered, thread_map(probe, filtered, URL_WORKERS)
+    ):
+        if issue:
+            issues.append(issue)
+        if warning:
+            warnings.append(warning)
+        if ok:
+            cache[url] = now
+
+    save_url_cache(cache)
 
     return issues, warnings
 
@@ -801,179 +1262,219 @@ def main():
         action="store_true",
         help="Also check external URLs (slow, hits the network).",
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop after the first check that reports an error.",
+    )
     args = parser.parse_args()
 
     print("=" * 60)
     print("n8n Course Reference Checker")
     print("=" * 60)
 
-    all_issues: list[str] = []
+    # Issues are printed as each check finishes; only their number is kept
+    issue_count = 0
+
+    # Scan each directory once; every check shares these listings.
+    pages = scan_pages()
+    workflows = scan_workflows()
+    available_workflows = {e.name for e in workflows}
+    # Parse every workflow JSON once; checks 2, 3 and 9 share the result.
+    loaded_workflows = load_workflows(workflows)
+
+    # Checks 4-10 only read files and never print.  pending[n]() returns
+    # check n's result; results are always reported in order.
+    later_checks = {
+        4: functools.partial(list_referenced_vs_available, pages, workflows),
+        5: check_toc_sync,
+        6: check_title_patterns,
+        7: check_notebook_structure,
+        8: functools.partial(check_download_directives, pages),
+        9: functools.partial(check_sticky_notes, workflows, loaded_workflows),
+        10: functools.partial(check_deprecated_syntax, workflows),
+    }
+    if args.fail_fast:
+        # Run each check only when its turn comes, so a failure skips the rest
+        pending = later_checks
+    else:
+        # Start them now and let them overlap with 1-3
+        pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        pending = {n: pool.submit(fn).result for n, fn in later_checks.items()}
+        pool.shutdown(wait=False)
 
     # ------------------------------------------------------------------
     # Check 1
     # ------------------------------------------------------------------
     print("\n[1] Checking notebook references...")
-    issues = check_notebooks()
-    all_issues.extend(issues)
+    issues = check_notebooks(pages, available_workflows)
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     else:
         print("  OK: All JSON references point to existing files")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 2
     # ------------------------------------------------------------------
     print("\n[2] Validating workflow JSON files...")
-    issues = check_workflow_files()
-    all_issues.extend(issues)
+    issues, parsed_workflows = check_workflow_files(workflows, loaded_workflows)
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     else:
         print("  OK: All workflow files are valid JSON")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 3
     # ------------------------------------------------------------------
     print("\n[3] Checking prompt documentation consistency...")
-    issues, warnings = check_prompt_consistency()
-    all_issues.extend(issues)
+    issues, warnings = check_prompt_consistency(parsed_workflows)
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     if warnings:
-        for warning in warnings:
-            print(f"  WARNING: {warning}")
+        print_lines("  WARNING: ", warnings)
     if not issues and not warnings:
         print("  OK: Documented prompts appear consistent with workflow files")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 4
     # ------------------------------------------------------------------
     print("\n[4] Reference summary...")
-    available, referenced = list_referenced_vs_available()
-    unreferenced = available - referenced
+    available, referenced = pending[4]()
+    # One pass over the names that appear on only one side
+    unreferenced: list[str] = []
+    missing: list[str] = []
+    for f in sorted(available ^ referenced):
+        (missing if f in referenced else unreferenced).append(f)
     if unreferenced:
         print(f"  Note: {len(unreferenced)} workflow(s) not referenced in book:")
-        for f in sorted(unreferenced):
-            print(f"    - {f}")
-    missing = referenced - available
+        print_lines("    - ", unreferenced)
     if missing:
         print(f"  ERROR: {len(missing)} referenced workflow(s) missing:")
-        for f in sorted(missing):
-            print(f"    - {f}")
-        all_issues.extend([f"Missing workflow: {f}" for f in missing])
+        print_lines("    - ", missing)
+        issue_count += len(missing)
+
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
 
     # ------------------------------------------------------------------
     # Check 5
     # ------------------------------------------------------------------
     print("\n[5] Checking TOC ↔ intro table sync...")
-    issues = check_toc_sync()
-    all_issues.extend(issues)
+    issues = pending[5]()
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     else:
         print("  OK: All _toc.yml entries match Course Structure table")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 6
     # ------------------------------------------------------------------
     print("\n[6] Checking title naming conventions...")
-    issues, warnings = check_title_patterns()
-    all_issues.extend(issues)
+    issues, warnings = pending[6]()
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     if warnings:
-        for warning in warnings:
-            print(f"  WARNING: {warning}")
+        print_lines("  WARNING: ", warnings)
     if not issues and not warnings:
         print("  OK: Title patterns are consistent")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 7
     # ------------------------------------------------------------------
     print("\n[7] Checking notebook structure (import/download/build)...")
-    issues, warnings = check_notebook_structure()
-    all_issues.extend(issues)
+    issues, warnings = pending[7]()
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     if warnings:
-        for warning in warnings:
-            print(f"  WARNING: {warning}")
+        print_lines("  WARNING: ", warnings)
     if not issues and not warnings:
         print("  OK: All workflow-documenting notebooks have required elements")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 8
     # ------------------------------------------------------------------
     print("\n[8] Checking {download} directives...")
-    issues = check_download_directives()
-    all_issues.extend(issues)
+    issues = pending[8]()
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     else:
         print("  OK: All {download} targets exist")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 9
     # ------------------------------------------------------------------
     print("\n[9] Checking sticky notes in workflow JSONs...")
-    issues, warnings = check_sticky_notes()
-    all_issues.extend(issues)
+    issues, warnings = pending[9]()
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     if warnings:
-        for warning in warnings:
-            print(f"  WARNING: {warning}")
+        print_lines("  WARNING: ", warnings)
     if not issues and not warnings:
         print("  OK: All workflow sticky notes have valid course URLs")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 10
     # ------------------------------------------------------------------
     print("\n[10] Checking for deprecated $node['...'] syntax...")
-    issues = check_deprecated_syntax()
-    all_issues.extend(issues)
+    issues = pending[10]()
+    issue_count += len(issues)
     if issues:
-        for issue in issues:
-            print(f"  ERROR: {issue}")
+        print_lines("  ERROR: ", issues)
     else:
         print("  OK: No deprecated $node['...'] syntax found")
 
+    if args.fail_fast and issue_count:
+        return report_result(issue_count)
+
     # ------------------------------------------------------------------
     # Check 11 (opt-in)
     # ------------------------------------------------------------------
     if args.check_urls:
         print("\n[11] Checking external URLs (this may be slow)...")
-        issues, warnings = check_external_urls()
-        all_issues.extend(issues)
+        issues, warnings = check_external_urls(pages)
+        issue_count += len(issues)
         if issues:
-            for issue in issues:
-                print(f"  ERROR: {issue}")
+            print_lines("  ERROR: ", issues)
         if warnings:
-            for warning in warnings:
-                print(f"  WARNING: {warning}")
+            print_lines("  WARNING: ", warnings)
         if not issues and not warnings:
             print("  OK: All external URLs are reachable")
     else:
         print("\n[11] External URL check skipped (use --check-urls to enable)")
 
-    # ------------------------------------------------------------------
-    # Final result
-    # ------------------------------------------------------------------
-    print("\n" + "=" * 60)
-    if all_issues:
-        print(f"FAILED: {len(all_issues)} issue(s) found")
-        return 1
-    else:
-        print("PASSED: No issues found")
-        return 0
+    return report_result(issue_count)
 
 
 if __name__ == "__main__":